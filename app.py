@@ -5,6 +5,7 @@ import os, sys
 
 from src.pipeline.train_pipeline import TrainingPipeline
 from src.pipeline.predict_pipeline import PredictionPipeline
+from src.components.drift_monitor import get_drift_monitor
 
 app = Flask(__name__)
 
@@ -20,7 +21,8 @@ def home():
 def train_route():
     try:
         lg.info("Training route initiated.")
-        train_pipeline = TrainingPipeline()
+        # Profiling is opt-in: ?profile=1 on the request or PROFILE_PIPELINES=1 in the environment
+        train_pipeline = TrainingPipeline(profile=request.args.get("profile"))
         train_pipeline.run_pipeline()
         lg.info("Training completed successfully.")
         return jsonify({"message": "Training Completed."})
@@ -38,7 +40,7 @@ def upload():
                 return jsonify({"error": "No file part in request"}), 400
 
             # Initialize prediction pipeline with request object
-            prediction_pipeline = PredictionPipeline(request)
+            prediction_pipeline = PredictionPipeline(request, profile=request.args.get("profile"))
             prediction_file_detail = prediction_pipeline.run_pipeline()
 
             lg.info(f"Prediction completed. Downloading {prediction_file_detail.prediction_file_name}")
@@ -53,6 +55,18 @@ def upload():
         lg.error(f"Error in prediction: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route("/drift")
+def drift_route():
+    try:
+        lg.info("Drift report requested.")
+        drift_monitor = get_drift_monitor()
+        if drift_monitor is None:
+            return jsonify({"message": "No drift reference yet. Run /train to enable drift monitoring."}), 404
+        return jsonify(drift_monitor.get_drift_report())
+    except Exception as e:
+        lg.error(f"Error in drift report: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 if __name__ == "__main__":
     lg.info("Starting Flask Application")
     app.run(host="0.0.0.0", port=5000, debug=True)
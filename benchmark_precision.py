@@ -0,0 +1,101 @@
+"""
+Compares float64 and float32 runs of the transformation and model-training stages.
+
+Reports array memory, peak traced memory, stage timings, prediction throughput and
+accuracy parity between the two precisions. Runs the real DataTransformation and the
+configured imbalance strategy, writing their artifacts to a temporary directory so
+nothing in the artifacts folder is touched.
+
+Usage: python benchmark_precision.py [path/to/wafer_fault.csv]
+"""
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+from src.constant import *
+from src.components.data_transformation import DataTransformation
+from src.components.model_trainer import ModelTrainer
+from src.utils.main_utils import MainUtils
+
+
+def run(feature_store_file_path: str, precision: str, artifact_dir: str) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    data_transformation = DataTransformation(feature_store_file_path=feature_store_file_path)
+    transformation_config = data_transformation.data_transformation_config
+    transformation_config.precision = precision
+    transformation_config.transformed_object_file_path = os.path.join(artifact_dir, 'preprocessor.pkl')
+    transformation_config.drift_reference_file_path = os.path.join(artifact_dir, 'drift_reference.pkl')
+    train_arr, test_arr, preprocessor_path = data_transformation.initiate_data_transformation()
+    transform_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model_trainer = ModelTrainer()
+    X_train, y_train = train_arr[:, :-1], train_arr[:, -1]
+    X_test, y_test = test_arr[:, :-1], test_arr[:, -1]
+    X_fit, y_fit, sample_weight = model_trainer.handle_imbalance(X_train, y_train)
+    report = model_trainer.evaluate_models(X_fit, X_test, y_fit, y_test, model_trainer.models, sample_weight)
+    train_seconds = time.perf_counter() - start
+
+    # Prediction throughput: preprocessing plus inference on the raw rows, as PredictionPipeline does
+    preprocessor = MainUtils.load_object(preprocessor_path)
+    features = data_transformation.get_data(feature_store_file_path, precision=precision).drop(columns=[TARGET_COLUMN])
+    model = model_trainer.models["XGBClassifier"]
+    repeats = 20
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.predict(preprocessor.transform(features))
+    predict_seconds = time.perf_counter() - start
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    predictions = {name: model.predict(X_test) for name, model in model_trainer.models.items()}
+
+    return {
+        "raw_mb": features.memory_usage(deep=True).sum() / 1024 ** 2,
+        "train_arr_mb": train_arr.nbytes / 1024 ** 2,
+        "peak_mb": peak / 1024 ** 2,
+        "transform_seconds": transform_seconds,
+        "train_seconds": train_seconds,
+        "predict_rows_per_second": repeats * len(features) / predict_seconds,
+        "report": report,
+        "predictions": predictions,
+    }
+
+
+def compare_precisions(feature_store_file_path: str) -> dict:
+    """Runs both precisions, each with its own temporary artifact directory."""
+    results = {}
+    for precision in ("float64", "float32"):
+        with tempfile.TemporaryDirectory() as artifact_dir:
+            results[precision] = run(feature_store_file_path, precision, artifact_dir)
+    return results
+
+
+def main():
+    feature_store_file_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(artifact_folder, "wafer_fault.csv")
+    results = compare_precisions(feature_store_file_path)
+
+    print(f"{'':28}{'float64':>12}{'float32':>12}{'ratio':>8}")
+    for key in ("raw_mb", "train_arr_mb", "peak_mb", "transform_seconds", "train_seconds", "predict_rows_per_second"):
+        full, reduced = results["float64"][key], results["float32"][key]
+        print(f"{key:28}{full:12.3f}{reduced:12.3f}{reduced / full if full else float('nan'):8.2f}")
+
+    print("\nAccuracy parity (float32 - float64):")
+    for name, full_report in results["float64"]["report"].items():
+        reduced_report = results["float32"]["report"][name]
+        deltas = ", ".join(
+            f"{metric}={reduced_report[metric] - full_report[metric]:+.4f}" for metric in full_report
+        )
+        agreement = np.mean(results["float64"]["predictions"][name] == results["float32"]["predictions"][name])
+        print(f"  {name}: {deltas}, prediction agreement={agreement:.2%}")
+
+
+if __name__ == "__main__":
+    main()
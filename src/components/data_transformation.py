@@ -12,6 +12,7 @@ from src.constant import *  # Ensure TARGET_COLUMN and artifact_folder are defin
 from src.exception import CustomException
 from src.logger import logging
 from src.utils.main_utils import MainUtils
+from src.components.drift_monitor import DriftMonitor
 
 
 @dataclass
@@ -20,6 +21,9 @@ class DataTransformationConfig:
     transformed_train_file_path = os.path.join(artifact_dir, 'train.npy')
     transformed_test_file_path = os.path.join(artifact_dir, 'test.npy')
     transformed_object_file_path = os.path.join(artifact_dir, 'preprocessor.pkl')
+    drift_reference_file_path = os.path.join(artifact_dir, 'drift_reference.pkl')
+    model_config_file_path = os.path.join('config', 'model.yaml')
+    precision = FLOAT_PRECISION
 
 
 class DataTransformation:
@@ -29,12 +33,12 @@ class DataTransformation:
         self.utils = MainUtils()
 
     @staticmethod
-    def get_data(feature_store_file_path: str) -> pd.DataFrame:
+    def get_data(feature_store_file_path: str, precision: str = FLOAT_PRECISION) -> pd.DataFrame:
         """
         Reads data from the feature store file path and renames the target column.
         """
         try:
-            data = pd.read_csv(feature_store_file_path)
+            data = MainUtils.read_sensor_csv(feature_store_file_path, precision=precision)
 
             # Ensure the "Good/Bad" column exists before renaming
             if "Good/Bad" not in data.columns:
@@ -59,6 +63,19 @@ class DataTransformation:
         except Exception as e:
             raise CustomException(e, sys)
 
+    @staticmethod
+    def append_target_column(features: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """
+        Appends the target as the last column without upcasting, unlike np.c_ with an integer target.
+        """
+        try:
+            array = np.empty((features.shape[0], features.shape[1] + 1), dtype=features.dtype)
+            array[:, :-1] = features
+            array[:, -1] = target
+            return array
+        except Exception as e:
+            raise CustomException(e, sys)
+
     def initiate_data_transformation(self):
         """
         Handles data transformation, including preprocessing and saving the preprocessor object.
@@ -66,7 +83,8 @@ class DataTransformation:
         logging.info("Entered initiate_data_transformation method of DataTransformation class")
 
         try:
-            dataframe = self.get_data(feature_store_file_path=self.feature_store_file_path)
+            precision = self.data_transformation_config.precision
+            dataframe = self.get_data(feature_store_file_path=self.feature_store_file_path, precision=precision)
 
             # Ensure the target column exists
             if TARGET_COLUMN not in dataframe.columns:
@@ -75,23 +93,45 @@ class DataTransformation:
             X = dataframe.drop(columns=[TARGET_COLUMN])
             y = np.where(dataframe[TARGET_COLUMN] == -1, 0, 1)  # Converting target labels
 
-            # Train-test split with fixed random state
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+            # Train-test split with fixed random state, stratified so the rare fault class lands in both splits
+            imbalance_config = self.utils.read_yaml_file(
+                self.data_transformation_config.model_config_file_path
+            ).get("imbalance_handling", {})
+            _, class_counts = np.unique(y, return_counts=True)
+            stratify = y if (
+                imbalance_config.get("stratify_split", True)
+                and len(class_counts) > 1
+                and class_counts.min() >= 2
+            ) else None
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=0.2, random_state=42, stratify=stratify
+            )
 
             preprocessor = self.get_data_transformer_object()
 
-            # Transforming data
-            X_train_scaled = preprocessor.fit_transform(X_train)
-            X_test_scaled = preprocessor.transform(X_test)
+            # Transforming data; imputer and scaler preserve float32 input, astype guards against upcasting
+            X_train_scaled = preprocessor.fit_transform(X_train).astype(precision, copy=False)
+            X_test_scaled = preprocessor.transform(X_test).astype(precision, copy=False)
 
             # Save preprocessor object
             preprocessor_path = self.data_transformation_config.transformed_object_file_path
             os.makedirs(os.path.dirname(preprocessor_path), exist_ok=True)
             self.utils.save_object(file_path=preprocessor_path, obj=preprocessor)
 
-            # Storing transformed arrays
-            train_arr = np.c_[X_train_scaled, y_train]
-            test_arr = np.c_[X_test_scaled, y_test]
+            # Save reference sensor distributions for drift monitoring at prediction time
+            drift_reference = DriftMonitor.build_reference(X_train)
+            self.utils.save_object(
+                file_path=self.data_transformation_config.drift_reference_file_path,
+                obj=drift_reference
+            )
+
+            # Storing transformed arrays in the configured precision
+            train_arr = self.append_target_column(X_train_scaled, y_train)
+            test_arr = self.append_target_column(X_test_scaled, y_test)
+            logging.info(
+                f"Transformed arrays ({precision}): train {train_arr.shape} {train_arr.nbytes / 1024 ** 2:.2f} MB, "
+                f"test {test_arr.shape} {test_arr.nbytes / 1024 ** 2:.2f} MB"
+            )
 
             logging.info("Successfully transformed data and saved preprocessor.")
 
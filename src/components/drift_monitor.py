@@ -0,0 +1,169 @@
+import sys
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.constant import *
+from src.exception import CustomException
+from src.logger import logging
+from src.utils.main_utils import MainUtils
+
+
+@dataclass
+class DriftMonitorConfig:
+    reference_file_path: str = os.path.join(artifact_folder, 'drift_reference.pkl')
+    n_bins: int = 10  # Quantile bins per sensor, plus one extra bin for missing values
+    window_size: int = 50  # Number of prediction batches kept in the rolling window
+    psi_threshold: float = 0.2  # PSI above this value is reported as drift
+    epsilon: float = 1e-4  # Avoids log(0) for empty bins
+
+
+class DriftMonitor:
+    """
+    Keeps fixed-memory, per-sensor histograms of rows passing through prediction
+    and compares them against the reference histograms saved at training time.
+    """
+
+    def __init__(self, reference: dict, config: DriftMonitorConfig = None):
+        self.drift_monitor_config = config or DriftMonitorConfig()
+        self.feature_names = list(reference["feature_names"])
+        self.inner_edges = reference["inner_edges"]
+        self.reference_proportions = reference["proportions"]
+
+        n_features, n_bins = self.reference_proportions.shape
+        self._window = deque(maxlen=self.drift_monitor_config.window_size)
+        self._window_counts = np.zeros((n_features, n_bins), dtype=np.int64)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bin_counts(X: np.ndarray, inner_edges: np.ndarray) -> np.ndarray:
+        """
+        Counts rows of X into each sensor's fixed bins; the last bin holds missing values.
+        """
+        n_features, n_inner = inner_edges.shape
+        n_bins = n_inner + 2
+
+        # Bin index = number of edges <= value, one vectorized comparison per edge rather than per sensor.
+        # NaN compares False everywhere, so missing values are moved to the last bin afterwards.
+        bin_index = np.zeros(X.shape, dtype=np.intp)
+        for j in range(n_inner):
+            bin_index += X >= inner_edges[:, j]
+        bin_index[np.isnan(X)] = n_bins - 1
+
+        # Offset each sensor's bins so a single bincount over the flattened index covers all sensors
+        bin_index += np.arange(n_features) * n_bins
+        counts = np.bincount(bin_index.ravel(), minlength=n_features * n_bins)
+        return counts.reshape(n_features, n_bins)
+
+    @classmethod
+    def build_reference(cls, features: pd.DataFrame, n_bins: int = None) -> dict:
+        """
+        Builds the reference summary (bin edges and bin proportions per sensor) from training features.
+        """
+        try:
+            n_bins = n_bins or DriftMonitorConfig.n_bins
+            X = features.to_numpy(dtype=np.float64)
+
+            quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+            with np.errstate(all='ignore'):
+                inner_edges = np.nanquantile(X, quantiles, axis=0).T
+            # Sensors with no observed values get edges at 0 so everything lands in the missing bin
+            inner_edges = np.nan_to_num(inner_edges, nan=0.0)
+
+            counts = cls._bin_counts(X, inner_edges)
+            proportions = counts / max(len(X), 1)
+
+            return {
+                "feature_names": list(features.columns),
+                "inner_edges": inner_edges,
+                "proportions": proportions,
+            }
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def update(self, features: pd.DataFrame) -> None:
+        """
+        Adds a batch of prediction rows to the rolling window.
+        """
+        try:
+            # Keep the batch in its own float dtype (float32 in reduced-precision mode) instead of upcasting
+            X = features.reindex(columns=self.feature_names).to_numpy()
+            if X.dtype.kind != 'f':
+                X = X.astype(np.float64)
+            batch_counts = self._bin_counts(X, self.inner_edges)
+
+            with self._lock:
+                if len(self._window) == self._window.maxlen:
+                    self._window_counts -= self._window[0]
+                self._window.append(batch_counts)
+                self._window_counts += batch_counts
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_drift_report(self) -> dict:
+        """
+        Returns the per-sensor population stability index (PSI) over the rolling window.
+        """
+        try:
+            with self._lock:
+                window_counts = self._window_counts.copy()
+                n_batches = len(self._window)
+
+            n_rows = int(window_counts[0].sum()) if len(window_counts) else 0
+            if n_rows == 0:
+                return {"n_batches": 0, "n_rows": 0, "drift_scores": {}, "drifted_sensors": []}
+
+            epsilon = self.drift_monitor_config.epsilon
+            expected = np.clip(self.reference_proportions, epsilon, None)
+            actual = np.clip(window_counts / n_rows, epsilon, None)
+            psi = ((actual - expected) * np.log(actual / expected)).sum(axis=1)
+
+            drift_scores = dict(zip(self.feature_names, np.round(psi, 6).tolist()))
+            drifted_sensors = [
+                name for name, score in drift_scores.items()
+                if score > self.drift_monitor_config.psi_threshold
+            ]
+
+            return {
+                "n_batches": n_batches,
+                "n_rows": n_rows,
+                "psi_threshold": self.drift_monitor_config.psi_threshold,
+                "drift_scores": drift_scores,
+                "drifted_sensors": drifted_sensors,
+            }
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+_drift_monitor = None
+_drift_monitor_mtime = None
+_drift_monitor_lock = threading.Lock()
+
+
+def get_drift_monitor(reference_file_path: str = None) -> DriftMonitor:
+    """
+    Returns the process-wide drift monitor, reloading it when the reference file changes after retraining.
+    Returns None if no reference has been saved yet, i.e. the model has not been retrained since drift
+    monitoring was added.
+    """
+    global _drift_monitor, _drift_monitor_mtime
+
+    try:
+        reference_file_path = reference_file_path or DriftMonitorConfig.reference_file_path
+        if not os.path.exists(reference_file_path):
+            return None
+
+        mtime = os.path.getmtime(reference_file_path)
+        with _drift_monitor_lock:
+            if _drift_monitor is None or mtime != _drift_monitor_mtime:
+                reference = MainUtils.load_object(reference_file_path)
+                _drift_monitor = DriftMonitor(reference)
+                _drift_monitor_mtime = mtime
+                logging.info(f"Drift monitor initialised from {reference_file_path}")
+            return _drift_monitor
+    except Exception as e:
+        raise CustomException(e, sys)
@@ -2,11 +2,13 @@ import sys
 import os
 import pandas as pd
 import numpy as np
-from sklearn.metrics import accuracy_score
+from scipy.stats import rankdata
 from xgboost.sklearn import XGBClassifier
 from sklearn.svm import SVC
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.model_selection import GridSearchCV, train_test_split
+from sklearn.neighbors import NearestNeighbors
+from sklearn.utils.class_weight import compute_sample_weight
 from src.constant import *
 from src.exception import CustomException
 from src.logger import logging
@@ -19,11 +21,17 @@ class ModelTrainerConfig:
     trained_model_path = os.path.join(artifact_folder, "model.pkl")
     expected_accuracy = 0.45  # Ensure consistency in threshold
     model_config_file_path = os.path.join('config', 'model.yaml')
+    imbalance_strategy = 'class_weight'  # none | class_weight | smote
+    selection_metric = 'f1'  # accuracy | precision | recall | f1 | roc_auc
+    smote_sampling_ratio = 0.5
+    smote_k_neighbors = 5
+    smote_chunk_size = 10000
 
 class ModelTrainer:
     def __init__(self):
         self.model_trainer_config = ModelTrainerConfig()
         self.utils = MainUtils()
+        self.load_imbalance_config()
         self.models = {
             'XGBClassifier': XGBClassifier(),
             'GradientBoostingClassifier': GradientBoostingClassifier(),
@@ -31,34 +39,166 @@ class ModelTrainer:
             'RandomForestClassifier': RandomForestClassifier()
         }
 
-    def evaluate_models(self, X_train, X_test, y_train, y_test, models):
+    def load_imbalance_config(self):
+        """Overrides the imbalance defaults with the `imbalance_handling` section of model.yaml."""
+        try:
+            model_config = self.utils.read_yaml_file(self.model_trainer_config.model_config_file_path)
+            for key, value in model_config.get("imbalance_handling", {}).items():
+                if key == "strategy":
+                    key = "imbalance_strategy"
+                if hasattr(self.model_trainer_config, key):
+                    setattr(self.model_trainer_config, key, value)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def compute_classification_metrics(y_true, y_pred, y_score=None) -> dict:
+        """Computes accuracy, precision, recall, F1 and ROC AUC for the fault class (label 1) in one pass."""
+        try:
+            y_true = np.asarray(y_true).astype(np.int64)
+            y_pred = np.asarray(y_pred).astype(np.int64)
+
+            tn, fp, fn, tp = np.bincount(2 * y_true + y_pred, minlength=4)[:4]
+            precision = tp / (tp + fp) if tp + fp else 0.0
+            recall = tp / (tp + fn) if tp + fn else 0.0
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+            n_pos = int(tp + fn)
+            n_neg = int(tn + fp)
+            roc_auc = np.nan
+            if y_score is not None and n_pos and n_neg:
+                # Mann-Whitney U statistic, equivalent to the area under the ROC curve
+                ranks = rankdata(y_score)
+                roc_auc = (ranks[y_true == 1].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+            return {
+                "accuracy": float((tp + tn) / len(y_true)),
+                "precision": float(precision),
+                "recall": float(recall),
+                "f1": float(f1),
+                "roc_auc": float(roc_auc),
+            }
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def get_positive_scores(model, X):
+        """Returns fault-class scores for AUC, or None if the model exposes neither probabilities nor a decision function."""
+        if hasattr(model, "predict_proba"):
+            return model.predict_proba(X)[:, 1]
+        if hasattr(model, "decision_function"):
+            return model.decision_function(X)
+        return None
+
+    def smote_oversample(self, X_train, y_train):
+        """
+        Appends SMOTE samples for the fault class. The original rows are copied once into a
+        preallocated float32 array and synthetic rows are generated into it in chunks, so peak
+        memory is the caller's training matrix plus one float32 copy with the extra rows,
+        with no further vstack/concatenate temporaries.
+        """
+        try:
+            config = self.model_trainer_config
+            y_train = np.asarray(y_train)
+            minority_mask = y_train == 1
+            n_minority = int(minority_mask.sum())
+            n_majority = len(y_train) - n_minority
+            n_synthetic = int(config.smote_sampling_ratio * n_majority) - n_minority
+
+            if n_synthetic <= 0 or n_minority < 2:
+                logging.info("SMOTE skipped: fault class already at target ratio or too small to interpolate.")
+                return X_train, y_train
+
+            X_minority = np.asarray(X_train[minority_mask], dtype=np.float32)
+            k_neighbors = min(config.smote_k_neighbors, n_minority - 1)
+            neighbors = NearestNeighbors(n_neighbors=k_neighbors + 1).fit(X_minority).kneighbors(
+                X_minority, return_distance=False
+            )[:, 1:]
+
+            n_rows = len(y_train)
+            X_resampled = np.empty((n_rows + n_synthetic, X_train.shape[1]), dtype=np.float32)
+            X_resampled[:n_rows] = X_train
+            y_resampled = np.empty(n_rows + n_synthetic, dtype=y_train.dtype)
+            y_resampled[:n_rows] = y_train
+            y_resampled[n_rows:] = 1
+
+            rng = np.random.default_rng(42)
+            for start in range(0, n_synthetic, config.smote_chunk_size):
+                size = min(config.smote_chunk_size, n_synthetic - start)
+                base = rng.integers(0, n_minority, size)
+                chosen = neighbors[base, rng.integers(0, k_neighbors, size)]
+                gap = rng.random(size, dtype=np.float32)[:, None]
+                offset = n_rows + start
+                X_resampled[offset:offset + size] = X_minority[base]
+                X_resampled[offset:offset + size] += gap * (X_minority[chosen] - X_minority[base])
+
+            logging.info(f"SMOTE added {n_synthetic} synthetic fault samples to {n_rows} training rows.")
+            return X_resampled, y_resampled
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def handle_imbalance(self, X_train, y_train):
+        """Applies the configured imbalance strategy and returns (X_train, y_train, sample_weight)."""
+        try:
+            strategy = self.model_trainer_config.imbalance_strategy
+            logging.info(f"Class imbalance strategy: {strategy}")
+
+            if strategy == "class_weight":
+                return X_train, y_train, compute_sample_weight("balanced", y_train)
+            if strategy == "smote":
+                X_train, y_train = self.smote_oversample(X_train, y_train)
+                return X_train, y_train, None
+            if strategy == "none":
+                return X_train, y_train, None
+
+            raise ValueError(f"Unknown imbalance strategy: {strategy}")
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def evaluate_models(self, X_train, X_test, y_train, y_test, models, sample_weight=None):
         """Trains and evaluates multiple models."""
         try:
             report = {}
             for name, model in models.items():
-                model.fit(X_train, y_train)  # Train model
+                model.fit(X_train, y_train, sample_weight=sample_weight)  # Train model
                 y_test_pred = model.predict(X_test)
-                test_model_score = accuracy_score(y_test, y_test_pred)
-                report[name] = test_model_score
+                y_test_score = self.get_positive_scores(model, X_test)
+                report[name] = self.compute_classification_metrics(y_test, y_test_pred, y_test_score)
             return report
         except Exception as e:
             raise CustomException(e, sys)
 
-    def get_best_model(self, X_train, X_test, y_train, y_test):
-        """Selects the best model based on test accuracy."""
+    def get_best_model(self, X_train, X_test, y_train, y_test, sample_weight=None):
+        """
+        Selects the best model by the configured selection metric among candidates that reach
+        the expected accuracy, breaking ties on accuracy.
+        """
         try:
-            model_report = self.evaluate_models(X_train, X_test, y_train, y_test, self.models)
+            model_report = self.evaluate_models(X_train, X_test, y_train, y_test, self.models, sample_weight)
             logging.info(f"Model performance: {model_report}")
 
-            best_model_name = max(model_report, key=model_report.get)
-            best_model_score = model_report[best_model_name]
+            # A model that flags every wafer as faulty can top recall/F1 with useless accuracy
+            expected_accuracy = self.model_trainer_config.expected_accuracy
+            eligible_models = [name for name, report in model_report.items() if report["accuracy"] >= expected_accuracy]
+            if not eligible_models:
+                raise Exception(f"No best model found with accuracy greater than {expected_accuracy}")
+
+            selection_metric = self.model_trainer_config.selection_metric
+            best_model_name = max(
+                eligible_models,
+                key=lambda name: (
+                    np.nan_to_num(model_report[name][selection_metric], nan=-np.inf),
+                    model_report[name]["accuracy"],
+                )
+            )
+            best_model_report = model_report[best_model_name]
             best_model_object = self.models[best_model_name]
 
-            return best_model_name, best_model_object, best_model_score
+            return best_model_name, best_model_object, best_model_report
         except Exception as e:
             raise CustomException(e, sys)
 
-    def finetune_best_model(self, best_model_name, best_model_object, X_train, y_train):
+    def finetune_best_model(self, best_model_name, best_model_object, X_train, y_train, sample_weight=None):
         """Fine-tunes the best model using GridSearchCV."""
         try:
             model_params = self.utils.read_yaml_file(self.model_trainer_config.model_config_file_path)["model_selection"]["model"]
@@ -67,8 +207,15 @@ class ModelTrainer:
                 return best_model_object
 
             param_grid = model_params[best_model_name]["search_param_grid"]
-            grid_search = GridSearchCV(best_model_object, param_grid=param_grid, cv=5, n_jobs=-1, verbose=1)
-            grid_search.fit(X_train, y_train)
+            grid_search = GridSearchCV(
+                best_model_object,
+                param_grid=param_grid,
+                scoring=self.model_trainer_config.selection_metric,
+                cv=5,
+                n_jobs=-1,
+                verbose=1
+            )
+            grid_search.fit(X_train, y_train, sample_weight=sample_weight)
 
             best_params = grid_search.best_params_
             logging.info(f"Best hyperparameters for {best_model_name}: {best_params}")
@@ -86,17 +233,26 @@ class ModelTrainer:
             X_train, y_train = train_array[:, :-1], train_array[:, -1]
             X_test, y_test = test_array[:, :-1], test_array[:, -1]
 
-            best_model_name, best_model, best_model_score = self.get_best_model(X_train, X_test, y_train, y_test)
+            X_fit, y_fit, sample_weight = self.handle_imbalance(X_train, y_train)
 
-            if best_model_score < self.model_trainer_config.expected_accuracy:
-                raise Exception(f"No best model found with accuracy greater than {self.model_trainer_config.expected_accuracy}")
+            best_model_name, best_model, best_model_report = self.get_best_model(
+                X_fit, X_test, y_fit, y_test, sample_weight
+            )
+            logging.info(f"Selected {best_model_name} with metrics: {best_model_report}")
 
-            best_model = self.finetune_best_model(best_model_name, best_model, X_train, y_train)
-            best_model.fit(X_train, y_train)
+            # Grid search runs on the original rows: SMOTE rows interpolated from training folds would
+            # leak into validation folds, so balanced weights stand in for oversampling during CV
+            search_weight = sample_weight
+            if self.model_trainer_config.imbalance_strategy == "smote":
+                search_weight = compute_sample_weight("balanced", y_train)
+            best_model = self.finetune_best_model(best_model_name, best_model, X_train, y_train, search_weight)
+            best_model.fit(X_fit, y_fit, sample_weight=sample_weight)
 
             y_pred = best_model.predict(X_test)
-            final_model_score = accuracy_score(y_test, y_pred)
-            logging.info(f"Final trained model: {best_model_name} with accuracy: {final_model_score}")
+            final_model_report = self.compute_classification_metrics(
+                y_test, y_pred, self.get_positive_scores(best_model, X_test)
+            )
+            logging.info(f"Final trained model: {best_model_name} with metrics: {final_model_report}")
 
             os.makedirs(os.path.dirname(self.model_trainer_config.trained_model_path), exist_ok=True)
             self.utils.save_object(self.model_trainer_config.trained_model_path, best_model)
@@ -1,6 +1,5 @@
 import os
 import sys
-import pandas as pd
 from flask import request
 from dataclasses import dataclass
 
@@ -8,6 +7,8 @@ from src.logger import logging
 from src.exception import CustomException
 from src.constant import *
 from src.utils.main_utils import MainUtils
+from src.components.drift_monitor import get_drift_monitor
+from src.utils.profiler import PipelineProfiler, is_profiling_enabled
 
 
 @dataclass
@@ -16,14 +17,17 @@ class PredictionPipelineConfig:
     prediction_file_name: str = "prediction_file.csv"
     model_file_path: str = os.path.join(artifact_folder, 'model.pkl')
     preprocessor_path: str = os.path.join(artifact_folder, 'preprocessor.pkl')
+    drift_reference_path: str = os.path.join(artifact_folder, 'drift_reference.pkl')
+    precision: str = FLOAT_PRECISION
     prediction_file_path: str = os.path.join(prediction_output_dirname, prediction_file_name)
 
 
 class PredictionPipeline:
-    def __init__(self, request: request):
+    def __init__(self, request: request, profile=None):
         self.request = request
         self.utils = MainUtils()
         self.prediction_pipeline_config = PredictionPipelineConfig()
+        self.profiler = PipelineProfiler("predict", enabled=is_profiling_enabled(profile))
 
     def save_input_files(self) -> str:
         """Save the uploaded CSV file and return its file path."""
@@ -79,16 +83,30 @@ class PredictionPipeline:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def update_drift_monitor(self, features):
+        """Feed input rows to the drift monitor without failing the prediction."""
+        try:
+            drift_monitor = get_drift_monitor(self.prediction_pipeline_config.drift_reference_path)
+            # No reference until the next training run; that is expected, not an error
+            if drift_monitor is not None:
+                drift_monitor.update(features)
+        except Exception as e:
+            logging.warning(f"Drift monitoring skipped: {e}")
+
     def get_predicted_dataframe(self, input_dataframe_path: str):
         """Load input CSV, make predictions, and save the results."""
         try:
             prediction_column_name = TARGET_COLUMN
-            input_dataframe = pd.read_csv(input_dataframe_path)
+            input_dataframe = self.utils.read_sensor_csv(
+                input_dataframe_path, precision=self.prediction_pipeline_config.precision
+            )
 
             if "Unnamed: 0" in input_dataframe.columns:
                 input_dataframe = input_dataframe.drop(columns=["Unnamed: 0"])
 
             predictions = self.predict(input_dataframe)
+            # Only batches that were actually predicted count as traffic for drift monitoring
+            self.update_drift_monitor(input_dataframe)
             input_dataframe[prediction_column_name] = predictions
 
             target_column_mapping = {0: 'bad', 1: 'good'}
@@ -108,8 +126,11 @@ class PredictionPipeline:
     def run_pipeline(self):
         """Run the complete prediction pipeline."""
         try:
-            input_csv_path = self.save_input_files()
-            self.get_predicted_dataframe(input_csv_path)
+            with self.profiler:
+                with self.profiler.stage("save_input_files"):
+                    input_csv_path = self.save_input_files()
+                with self.profiler.stage("get_predicted_dataframe"):
+                    self.get_predicted_dataframe(input_csv_path)
 
             return self.prediction_pipeline_config
         except Exception as e:
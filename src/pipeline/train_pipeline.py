@@ -5,9 +5,12 @@ from src.components.data_ingestion import DataIngestion
 from src.components.data_transformation import DataTransformation
 from src.components.model_trainer import ModelTrainer
 from src.exception import CustomException
+from src.utils.profiler import PipelineProfiler, is_profiling_enabled
 
 
 class TrainingPipeline:
+    def __init__(self, profile=None):
+        self.profiler = PipelineProfiler("train", enabled=is_profiling_enabled(profile))
 
     def start_data_ingestion(self):
         try:
@@ -38,9 +41,13 @@ class TrainingPipeline:
         
     def run_pipeline(self):
         try:
-            feature_store_file_path = self.start_data_ingestion()
-            train_arr,test_arr,preprocessor_path = self.start_data_transformation(feature_store_file_path)
-            r2_square = self.start_model_training(train_arr,test_arr)
+            with self.profiler:
+                with self.profiler.stage("data_ingestion"):
+                    feature_store_file_path = self.start_data_ingestion()
+                with self.profiler.stage("data_transformation"):
+                    train_arr,test_arr,preprocessor_path = self.start_data_transformation(feature_store_file_path)
+                with self.profiler.stage("model_training"):
+                    r2_square = self.start_model_training(train_arr,test_arr)
 
             print("training completed. Trained model score:", r2_square)
 
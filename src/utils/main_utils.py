@@ -45,6 +45,21 @@ class MainUtils:
             logging.error("Error reading schema configuration file")
             raise CustomException(e, sys) from e
 
+    @staticmethod
+    def read_sensor_csv(file_path: str, precision: str = FLOAT_PRECISION) -> pd.DataFrame:
+        """
+        Reads a sensor CSV with explicit dtypes so sensor columns are parsed directly into the configured precision.
+        """
+        try:
+            columns = pd.read_csv(file_path, nrows=0).columns
+            dtype = {column: precision for column in columns if column.startswith("Sensor-")}
+
+            return pd.read_csv(file_path, dtype=dtype, na_values=["na"])
+
+        except Exception as e:
+            logging.error(f"Error reading sensor CSV file: {file_path}")
+            raise CustomException(e, sys) from e
+
     @staticmethod
     def save_object(file_path: str, obj: object) -> None:
         """
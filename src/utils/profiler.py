@@ -0,0 +1,230 @@
+import sys
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.exception import CustomException
+from src.logger import logging, LOG_DIR
+
+
+@dataclass
+class PipelineProfilerConfig:
+    profile_dir: str = os.path.join(LOG_DIR, "profiles")
+    env_var: str = "PROFILE_PIPELINES"  # Set to 1/true/yes/on to profile every run
+    sampling_interval: float = 0.005  # Seconds between stack samples
+    top_allocations: int = 25
+    top_functions: int = 50
+
+
+# tracemalloc is process-wide; concurrent profiled runs share it and it stops when the last one exits
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_runs = 0
+_tracemalloc_started = False
+
+
+def _acquire_tracemalloc() -> None:
+    global _tracemalloc_runs, _tracemalloc_started
+    with _tracemalloc_lock:
+        if _tracemalloc_runs == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_started = True
+        _tracemalloc_runs += 1
+
+
+def _release_tracemalloc() -> None:
+    global _tracemalloc_runs, _tracemalloc_started
+    with _tracemalloc_lock:
+        _tracemalloc_runs -= 1
+        # Leave tracing alone if something other than the profiler started it
+        if _tracemalloc_runs == 0 and _tracemalloc_started:
+            tracemalloc.stop()
+            _tracemalloc_started = False
+
+
+def is_profiling_enabled(flag=None) -> bool:
+    """
+    Returns True if the request flag or the PROFILE_PIPELINES environment variable asks for profiling.
+    """
+    value = flag if flag else os.getenv(PipelineProfilerConfig.env_var, "")
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+class PipelineProfiler:
+    """
+    Opt-in profiler for a pipeline run. Records cProfile stats, sampled call stacks
+    and per-stage memory peaks, then saves them as timestamped files under logs/profiles.
+    When disabled every method is a no-op.
+
+    Per-stage memory peaks come from tracemalloc.reset_peak (Python >= 3.9). On older
+    Pythons the value is the running peak since tracing started and is saved as
+    memory_peak_cumulative_mb instead. tracemalloc is process-wide, so with concurrent
+    profiled runs each run's memory figures also include the other runs' allocations,
+    and one run's reset_peak clears the peak the others are tracking.
+    """
+
+    def __init__(self, run_name: str, enabled: bool = False):
+        self.run_name = run_name
+        self.enabled = enabled
+        self.profiler_config = PipelineProfilerConfig()
+        self.stages = []
+        self._profile = None
+        self._stack_counts = Counter()
+        self._stop_sampling = threading.Event()
+        self._sampler = None
+        self._tracing_memory = False
+        self._start_time = None
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+
+        self._start_time = time.perf_counter()
+        _acquire_tracemalloc()
+        self._tracing_memory = True
+
+        self._profile = cProfile.Profile()
+        try:
+            self._profile.enable()
+        except ValueError as e:
+            # Only one deterministic profiler can be active at a time; keep sampling and memory tracking
+            logging.warning(f"cProfile unavailable for {self.run_name} run: {e}")
+            self._profile = None
+
+        self._sampler = threading.Thread(
+            target=self._sample_stacks, args=(threading.get_ident(),), daemon=True
+        )
+        self._sampler.start()
+        logging.info(f"Profiling enabled for {self.run_name} run")
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        if self.enabled:
+            try:
+                self.save(failed=exc_type is not None)
+            except Exception as e:
+                # Never let profiling output mask the pipeline's own result or error
+                logging.warning(f"Could not save profiling artifacts for {self.run_name} run: {e}")
+            finally:
+                if self._tracing_memory:
+                    _release_tracemalloc()
+                    self._tracing_memory = False
+        return False
+
+    def _sample_stacks(self, thread_id: int) -> None:
+        """Periodically records the profiled thread's call stack in folded (flamegraph) format."""
+        while not self._stop_sampling.wait(self.profiler_config.sampling_interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self._stack_counts[";".join(reversed(stack))] += 1
+
+    @contextmanager
+    def stage(self, name: str):
+        """Times a pipeline stage and records its memory peak."""
+        if not self.enabled:
+            yield
+            return
+
+        memory_before = None
+        try:
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            memory_before, _ = tracemalloc.get_traced_memory()
+        except Exception as e:
+            logging.warning(f"Could not start memory tracking for stage {name} of {self.run_name} run: {e}")
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Profiling bookkeeping must never fail the stage or hide the stage's own error
+            try:
+                self._record_stage(name, time.perf_counter() - start, memory_before)
+            except Exception as e:
+                logging.warning(f"Could not record stage {name} of {self.run_name} run: {e}")
+
+    def _record_stage(self, name: str, seconds: float, memory_before) -> None:
+        memory_after, memory_peak = tracemalloc.get_traced_memory()
+        peak_key = "memory_peak_mb" if hasattr(tracemalloc, "reset_peak") else "memory_peak_cumulative_mb"
+        self.stages.append({
+            "stage": name,
+            "seconds": round(seconds, 4),
+            "memory_before_mb": None if memory_before is None else round(memory_before / 1024 ** 2, 3),
+            "memory_after_mb": round(memory_after / 1024 ** 2, 3),
+            peak_key: round(memory_peak / 1024 ** 2, 3),
+            "top_allocations": self._top_allocations(tracemalloc.take_snapshot(), 10),
+        })
+
+    @staticmethod
+    def _top_allocations(snapshot, limit: int) -> list:
+        """Returns the largest live allocations in a tracemalloc snapshot, grouped by source line."""
+        return [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_mb": round(stat.size / 1024 ** 2, 3),
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:limit]
+        ]
+
+    def save(self, failed: bool = False) -> str:
+        """Stops profiling and writes the collected artifacts, returning their directory."""
+        try:
+            if self._profile is not None:
+                self._profile.disable()
+            self._stop_sampling.set()
+            if self._sampler is not None:
+                self._sampler.join()
+
+            snapshot = tracemalloc.take_snapshot()
+
+            # Microseconds plus a short uuid keep concurrent runs finishing in the same second apart
+            timestamp = datetime.now().strftime('%m_%d_%Y_%H_%M_%S_%f')
+            profile_dir = os.path.join(
+                self.profiler_config.profile_dir, f"{timestamp}_{self.run_name}_{uuid.uuid4().hex[:8]}"
+            )
+            os.makedirs(profile_dir)
+
+            if self._profile is not None:
+                # cprofile.prof opens in snakeviz or flameprof; cprofile.txt is a readable summary
+                self._profile.dump_stats(os.path.join(profile_dir, "cprofile.prof"))
+                summary = io.StringIO()
+                stats = pstats.Stats(self._profile, stream=summary).sort_stats("cumulative")
+                stats.print_stats(self.profiler_config.top_functions)
+                with open(os.path.join(profile_dir, "cprofile.txt"), "w") as file_obj:
+                    file_obj.write(summary.getvalue())
+
+            # Folded stacks for flamegraph.pl, inferno or speedscope
+            with open(os.path.join(profile_dir, "stacks.folded"), "w") as file_obj:
+                for stack, count in self._stack_counts.most_common():
+                    file_obj.write(f"{stack} {count}\n")
+
+            top_allocations = self._top_allocations(snapshot, self.profiler_config.top_allocations)
+            with open(os.path.join(profile_dir, "memory.json"), "w") as file_obj:
+                json.dump({
+                    "run": self.run_name,
+                    "failed": failed,
+                    "total_seconds": round(time.perf_counter() - self._start_time, 4),
+                    "stages": self.stages,
+                    "top_allocations": top_allocations,
+                }, file_obj, indent=2)
+
+            logging.info(f"Profiling artifacts for {self.run_name} run saved to {profile_dir}")
+            return profile_dir
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components.drift_monitor import DriftMonitor, DriftMonitorConfig, get_drift_monitor
+
+
+def make_features(n_rows, n_sensors=5, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(loc=np.arange(n_sensors), scale=1 + np.arange(n_sensors), size=(n_rows, n_sensors))
+    return pd.DataFrame(X, columns=[f"Sensor-{i + 1}" for i in range(n_sensors)])
+
+
+def test_bin_counts_match_digitize_with_missing_values():
+    X = make_features(200).to_numpy()
+    X[::7, 1] = np.nan
+    X[:, 3] = np.nan
+    inner_edges = np.sort(np.random.default_rng(1).normal(size=(X.shape[1], 9)), axis=1)
+
+    counts = DriftMonitor._bin_counts(X, inner_edges)
+
+    assert counts.shape == (X.shape[1], 11)
+    for i in range(X.shape[1]):
+        column = X[:, i]
+        missing = np.isnan(column)
+        expected = np.bincount(np.digitize(column[~missing], inner_edges[i]), minlength=10)
+        np.testing.assert_array_equal(counts[i, :10], expected)
+        assert counts[i, 10] == missing.sum()
+
+
+def test_bin_counts_keep_float32_input():
+    X = make_features(100).to_numpy()
+    inner_edges = DriftMonitor.build_reference(pd.DataFrame(X))["inner_edges"]
+
+    np.testing.assert_array_equal(
+        DriftMonitor._bin_counts(X.astype(np.float32), inner_edges),
+        DriftMonitor._bin_counts(X.astype(np.float32).astype(np.float64), inner_edges),
+    )
+
+
+def test_window_evicts_oldest_batches():
+    reference = DriftMonitor.build_reference(make_features(500))
+    monitor = DriftMonitor(reference, DriftMonitorConfig(window_size=3))
+
+    batches = [make_features(20 + i, seed=i + 10) for i in range(5)]
+    for batch in batches:
+        monitor.update(batch)
+
+    expected = sum(DriftMonitor._bin_counts(batch.to_numpy(), monitor.inner_edges) for batch in batches[-3:])
+    np.testing.assert_array_equal(monitor._window_counts, expected)
+    report = monitor.get_drift_report()
+    assert report["n_batches"] == 3
+    assert report["n_rows"] == sum(len(batch) for batch in batches[-3:])
+
+
+def test_psi_near_zero_on_reference_distribution():
+    features = make_features(5000)
+    monitor = DriftMonitor(DriftMonitor.build_reference(features))
+
+    monitor.update(features)
+    assert max(monitor.get_drift_report()["drift_scores"].values()) == pytest.approx(0.0, abs=1e-9)
+
+    fresh = DriftMonitor(DriftMonitor.build_reference(features))
+    fresh.update(make_features(5000, seed=42))
+    report = fresh.get_drift_report()
+    assert max(report["drift_scores"].values()) < 0.05
+    assert report["drifted_sensors"] == []
+
+
+def test_psi_flags_shifted_sensor():
+    features = make_features(2000)
+    monitor = DriftMonitor(DriftMonitor.build_reference(features))
+
+    shifted = make_features(2000, seed=3)
+    shifted["Sensor-2"] += 5
+    monitor.update(shifted)
+
+    assert monitor.get_drift_report()["drifted_sensors"] == ["Sensor-2"]
+
+
+def test_no_reference_returns_none(tmp_path):
+    assert get_drift_monitor(str(tmp_path / "drift_reference.pkl")) is None
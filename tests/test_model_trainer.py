@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+from src.components.model_trainer import ModelTrainer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def model_trainer(monkeypatch):
+    # ModelTrainer reads config/model.yaml relative to the working directory
+    monkeypatch.chdir(REPO_ROOT)
+    return ModelTrainer()
+
+
+def test_classification_metrics_match_sklearn():
+    y_true = np.array([0, 0, 1, 1, 0, 1, 0, 0, 1, 0])
+    y_pred = np.array([0, 1, 1, 0, 0, 1, 0, 0, 1, 1])
+    # Includes a tie across classes (0.4) and within a class (0.1)
+    y_score = np.array([0.1, 0.6, 0.8, 0.4, 0.4, 0.9, 0.3, 0.1, 0.7, 0.55])
+
+    metrics = ModelTrainer.compute_classification_metrics(y_true, y_pred, y_score)
+
+    assert metrics["accuracy"] == pytest.approx(accuracy_score(y_true, y_pred))
+    assert metrics["precision"] == pytest.approx(precision_score(y_true, y_pred))
+    assert metrics["recall"] == pytest.approx(recall_score(y_true, y_pred))
+    assert metrics["f1"] == pytest.approx(f1_score(y_true, y_pred))
+    assert metrics["roc_auc"] == pytest.approx(roc_auc_score(y_true, y_score))
+
+
+def test_classification_metrics_without_fault_predictions():
+    y_true = np.array([0, 0, 1, 0])
+    y_pred = np.zeros(4)
+
+    metrics = ModelTrainer.compute_classification_metrics(y_true, y_pred)
+
+    assert metrics["precision"] == precision_score(y_true, y_pred, zero_division=0)
+    assert metrics["recall"] == 0.0
+    assert metrics["f1"] == 0.0
+    assert np.isnan(metrics["roc_auc"])
+
+
+def test_smote_oversample_appends_labelled_synthetic_rows(model_trainer):
+    rng = np.random.default_rng(0)
+    X_train = rng.normal(size=(20, 4))
+    y_train = np.zeros(20)
+    y_train[[2, 7, 11]] = 1
+
+    model_trainer.model_trainer_config.smote_sampling_ratio = 0.5
+    model_trainer.model_trainer_config.smote_chunk_size = 2  # Exercise chunked generation
+    X_resampled, y_resampled = model_trainer.smote_oversample(X_train, y_train)
+
+    n_synthetic = int(0.5 * 17) - 3
+    assert X_resampled.shape == (20 + n_synthetic, 4)
+    assert X_resampled.dtype == np.float32
+    np.testing.assert_allclose(X_resampled[:20], X_train.astype(np.float32))
+    np.testing.assert_array_equal(y_resampled[:20], y_train)
+    assert (y_resampled[20:] == 1).all()
+
+    # Synthetic rows are interpolations between fault rows, so they stay within their bounding box
+    X_minority = X_train[y_train == 1].astype(np.float32)
+    synthetic = X_resampled[20:]
+    assert (synthetic >= X_minority.min(axis=0) - 1e-6).all()
+    assert (synthetic <= X_minority.max(axis=0) + 1e-6).all()
+
+
+class ConstantClassifier:
+    """Predicts a single label for every row; stands in for a degenerate candidate."""
+
+    def __init__(self, label):
+        self.label = label
+
+    def fit(self, X, y, sample_weight=None):
+        return self
+
+    def predict(self, X):
+        return np.full(len(X), self.label)
+
+
+def test_best_model_must_reach_expected_accuracy(model_trainer):
+    # Mirrors the bundled dataset: 1 fault in 20 test rows
+    y_test = np.zeros(20)
+    y_test[3] = 1
+    X = np.zeros((20, 2))
+    model_trainer.models = {
+        "AllFaults": ConstantClassifier(1),  # f1 = 0.095, accuracy = 0.05
+        "AllGood": ConstantClassifier(0),  # f1 = 0.0, accuracy = 0.95
+    }
+
+    best_model_name, _, best_model_report = model_trainer.get_best_model(X, X, y_test, y_test)
+
+    assert best_model_name == "AllGood"
+    assert best_model_report["accuracy"] == pytest.approx(0.95)
+
+
+def test_no_model_reaching_expected_accuracy_raises(model_trainer):
+    y_test = np.zeros(20)
+    y_test[3] = 1
+    X = np.zeros((20, 2))
+    model_trainer.models = {"AllFaults": ConstantClassifier(1)}
+
+    with pytest.raises(Exception, match="No best model found"):
+        model_trainer.get_best_model(X, X, y_test, y_test)
@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+import pytest
+
+import benchmark_precision
+from src.components.data_transformation import DataTransformation
+from src.utils.main_utils import MainUtils
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FEATURE_STORE_FILE_PATH = os.path.join(REPO_ROOT, "artifacts", "wafer_fault.csv")
+
+
+def test_read_sensor_csv_parses_sensors_as_float32():
+    data = MainUtils.read_sensor_csv(FEATURE_STORE_FILE_PATH, precision="float32")
+
+    sensor_columns = [column for column in data.columns if column.startswith("Sensor-")]
+    assert len(sensor_columns) == 590
+    assert (data[sensor_columns].dtypes == np.float32).all()
+    assert data["Good/Bad"].dtype != np.float32
+
+
+def test_append_target_column_keeps_feature_dtype():
+    features = np.arange(12, dtype=np.float32).reshape(4, 3)
+    target = np.array([0, 1, 0, 1])
+
+    array = DataTransformation.append_target_column(features, target)
+
+    assert array.dtype == np.float32
+    np.testing.assert_array_equal(array[:, :-1], features)
+    np.testing.assert_array_equal(array[:, -1], target)
+
+
+def test_float32_matches_float64_accuracy(monkeypatch):
+    # The transformation and trainer read config/model.yaml relative to the working directory
+    monkeypatch.chdir(REPO_ROOT)
+    results = benchmark_precision.compare_precisions(FEATURE_STORE_FILE_PATH)
+    full, reduced = results["float64"], results["float32"]
+
+    assert reduced["train_arr_mb"] == pytest.approx(full["train_arr_mb"] / 2)
+
+    # The bundled test split has 20 rows, so one flipped prediction moves accuracy by 0.05
+    for name, full_report in full["report"].items():
+        reduced_report = reduced["report"][name]
+        agreement = np.mean(full["predictions"][name] == reduced["predictions"][name])
+        assert agreement >= 0.95, name
+        assert abs(reduced_report["accuracy"] - full_report["accuracy"]) <= 0.05 + 1e-9, name
+        if not np.isnan(full_report["roc_auc"]):
+            assert abs(reduced_report["roc_auc"] - full_report["roc_auc"]) <= 0.15, name
@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+import tracemalloc
+
+import pytest
+
+from src.utils import profiler as profiler_module
+from src.utils.profiler import PipelineProfiler, is_profiling_enabled
+
+
+def make_profiler(tmp_path, run_name="predict", enabled=True):
+    pipeline_profiler = PipelineProfiler(run_name, enabled=enabled)
+    pipeline_profiler.profiler_config.profile_dir = str(tmp_path)
+    return pipeline_profiler
+
+
+def work():
+    data = [list(range(1000)) for _ in range(50)]
+    return sum(len(row) for row in data)
+
+
+@pytest.fixture(autouse=True)
+def no_tracing_leak():
+    assert not tracemalloc.is_tracing()
+    yield
+    assert not tracemalloc.is_tracing()
+    assert profiler_module._tracemalloc_runs == 0
+
+
+def test_is_profiling_enabled(monkeypatch):
+    monkeypatch.delenv("PROFILE_PIPELINES", raising=False)
+    assert not is_profiling_enabled(None)
+    assert is_profiling_enabled("1")
+    assert is_profiling_enabled(True)
+
+    monkeypatch.setenv("PROFILE_PIPELINES", "yes")
+    assert is_profiling_enabled(None)
+
+
+def test_profiled_run_writes_artifacts(tmp_path):
+    pipeline_profiler = make_profiler(tmp_path)
+    with pipeline_profiler:
+        with pipeline_profiler.stage("load"):
+            work()
+        with pipeline_profiler.stage("predict"):
+            work()
+
+    (profile_dir,) = os.listdir(tmp_path)
+    assert {"cprofile.prof", "cprofile.txt", "stacks.folded", "memory.json"} <= set(os.listdir(tmp_path / profile_dir))
+    with open(tmp_path / profile_dir / "memory.json") as file_obj:
+        memory = json.load(file_obj)
+    assert memory["failed"] is False
+    assert [stage["stage"] for stage in memory["stages"]] == ["load", "predict"]
+
+
+def test_concurrent_runs_write_separate_directories(tmp_path):
+    errors = []
+    start = threading.Barrier(2)
+
+    def run():
+        try:
+            pipeline_profiler = make_profiler(tmp_path)
+            start.wait()
+            with pipeline_profiler:
+                for name in ("load", "predict"):
+                    with pipeline_profiler.stage(name):
+                        work()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(os.listdir(tmp_path)) == 2
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracing_stops_only_after_last_run(tmp_path):
+    outer = make_profiler(tmp_path, "train")
+    inner = make_profiler(tmp_path, "predict")
+
+    with outer:
+        with inner:
+            pass
+        assert tracemalloc.is_tracing()
+        with outer.stage("after_inner"):
+            work()
+    assert [stage["stage"] for stage in outer.stages] == ["after_inner"]
+
+
+def test_externally_started_tracing_is_left_running(tmp_path):
+    tracemalloc.start()
+    try:
+        with make_profiler(tmp_path):
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_failed_save_does_not_mask_pipeline_error(tmp_path, monkeypatch):
+    pipeline_profiler = make_profiler(tmp_path)
+    monkeypatch.setattr(pipeline_profiler, "save", lambda failed=False: 1 / 0)
+
+    with pytest.raises(KeyError, match="real error"):
+        with pipeline_profiler:
+            with pipeline_profiler.stage("predict"):
+                raise KeyError("real error")
+
+
+def test_failed_save_does_not_fail_successful_run(tmp_path, monkeypatch):
+    pipeline_profiler = make_profiler(tmp_path)
+    monkeypatch.setattr(pipeline_profiler, "save", lambda failed=False: 1 / 0)
+
+    with pipeline_profiler:
+        result = work()
+    assert result == 50000
+
+
+def test_failed_stage_bookkeeping_does_not_mask_stage_error(tmp_path, monkeypatch):
+    pipeline_profiler = make_profiler(tmp_path)
+    monkeypatch.setattr(pipeline_profiler, "_record_stage", lambda *args: 1 / 0)
+
+    with pytest.raises(KeyError, match="real error"):
+        with pipeline_profiler:
+            with pipeline_profiler.stage("predict"):
+                raise KeyError("real error")
+
+
+def test_disabled_profiler_is_noop(tmp_path):
+    pipeline_profiler = make_profiler(tmp_path, enabled=False)
+
+    with pipeline_profiler:
+        with pipeline_profiler.stage("predict"):
+            assert not tracemalloc.is_tracing()
+            work()
+
+    assert pipeline_profiler.stages == []
+    assert os.listdir(tmp_path) == []